@@ -0,0 +1,307 @@
+import gc
+import os
+import sys
+import random
+import contextlib
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from config import *
+
+
+class AllocationTracker:
+    """Отслеживание аллокаций памяти по кадрам и фазам игры"""
+
+    PHASES = ("events", "update", "draw") #Фазы обработки кадра
+
+    def __init__(self, report_interval=ALLOC_REPORT_INTERVAL, top_sites=ALLOC_TOP_SITES,
+                 history=None, metrics_source=None, sample_interval=ALLOC_SAMPLE_INTERVAL):
+        self.report_interval = report_interval #Интервал вывода отчета в замеренных кадрах
+        self.top_sites = top_sites #Количество мест в коде в отчете
+        self.metrics_source = metrics_source #Функция с дополнительными метриками для отчета
+        self.sample_interval = sample_interval #Замеряется каждый N-й кадр
+        self.frames_seen = 0 #Количество кадров с момента запуска, включая незамеренные
+        self.frame_count = 0 #Количество замеренных кадров
+        self.frame_state = None #Состояние игры в текущем кадре
+        self.frame_phases = {} #Статистика фаз текущего кадра
+        #Статистика последних кадров (не больше history или интервала отчета)
+        self.frames = deque(maxlen=history or report_interval or None)
+        self.phase_totals = {} #Статистика интервала по парам (состояние, фаза)
+        self.sites = {} #Аллокации интервала по (состояние, фаза) и функциям
+        self.current = None #Статистика измеряемой фазы
+        self.current_sites = None #Места аллокаций измеряемой фазы
+        self.last_code = None #Функция, выполнявшая предыдущую инструкцию
+        self.last_bytes = 0 #Занятая память после предыдущей инструкции
+        #Собственный код замера фаз не трассируется
+        self.ignored_code = AllocationTracker.phase.__wrapped__.__code__
+
+    def start(self):
+        """Запуск отслеживания аллокаций"""
+        if not tracemalloc.is_tracing(): #Если отслеживание еще не запущено
+            tracemalloc.start()
+
+    def stop(self):
+        """Остановка отслеживания аллокаций"""
+        tracemalloc.stop()
+
+    def sample_frame(self):
+        """Проверка, нужно ли замерять текущий кадр"""
+        self.frames_seen += 1
+        return self.frames_seen % self.sample_interval == 0
+
+    def begin_frame(self, state_name):
+        """Начало нового кадра"""
+        self.frame_state = state_name #Запоминаем состояние игры на начало кадра
+        self.frame_phases = {}
+
+    def trace(self, frame, event, arg, get_traced_memory=tracemalloc.get_traced_memory):
+        """Учет аллокаций после каждой инструкции байт-кода (для sys.settrace)
+
+        Аллокацией считается инструкция, после которой выросла занятая память.
+        Освобождения не вычитаются, поэтому временный объект учитывается, даже если
+        рядом освобождается предыдущий. Не видны аллокации, освобожденные внутри одной
+        инструкции (например, внутри C-функции), и объекты из списков свободных
+        объектов CPython (float, мелкие кортежи), которые не выделяют память.
+        """
+        size = get_traced_memory()[0]
+        new_bytes = size - self.last_bytes #Байты, выделенные предыдущей инструкцией
+        self.last_bytes = size
+        if new_bytes > 0:
+            self.record(self.last_code, new_bytes)
+
+        code = frame.f_code
+        if event == "call":
+            if code is self.ignored_code or code.co_filename == contextlib.__file__:
+                return None #Код замера фаз не трассируем
+            frame.f_trace_lines = False #Трассируем инструкции, а не строки
+            frame.f_trace_opcodes = True
+        self.last_code = code
+        return self.trace
+
+    def record(self, code, size):
+        """Добавление аллокации фазе и функции, в которой она произошла"""
+        if code is None:
+            return
+        self.current["allocs"] += 1
+        self.current["alloc_bytes"] += size
+        site = self.current_sites.get(code)
+        if site is None: #Первая аллокация в этой функции за интервал
+            site = self.current_sites[code] = [0, 0]
+        site[0] += 1
+        site[1] += size
+        #Собственные аллокации учета не относим к следующей инструкции
+        self.last_bytes = tracemalloc.get_traced_memory()[0]
+
+    @contextmanager
+    def phase(self, name):
+        """Измерение аллокаций внутри одной фазы кадра"""
+        self.current = {"allocs": 0, "alloc_bytes": 0}
+        self.current_sites = self.sites.setdefault((self.frame_state, name), {})
+        self.last_code = None
+        self.last_bytes = tracemalloc.get_traced_memory()[0]
+        sys.settrace(self.trace)
+        try:
+            yield
+        finally:
+            sys.settrace(None)
+            self.frame_phases[name] = self.current
+
+    def end_frame(self):
+        """Завершение кадра и накопление статистики"""
+        frame = {
+            "state": self.frame_state,
+            "allocs": sum(p["allocs"] for p in self.frame_phases.values()),
+            "alloc_bytes": sum(p["alloc_bytes"] for p in self.frame_phases.values()),
+        }
+        self.frames.append(frame)
+
+        #Накопление статистики интервала по состояниям и фазам
+        for name, stats in self.frame_phases.items():
+            totals = self.phase_totals.setdefault((self.frame_state, name), {
+                "frames": 0, "allocs": 0, "alloc_bytes": 0, "max_allocs": 0,
+            })
+            totals["frames"] += 1
+            totals["allocs"] += stats["allocs"]
+            totals["alloc_bytes"] += stats["alloc_bytes"]
+            totals["max_allocs"] = max(totals["max_allocs"], stats["allocs"])
+
+        self.frame_count += 1
+        #Выводим отчет по окончании интервала
+        if self.report_interval and self.frame_count % self.report_interval == 0:
+            print(self.report())
+
+    def reset_interval(self):
+        """Начало нового интервала отчета"""
+        self.frames.clear()
+        self.phase_totals.clear()
+        self.sites.clear()
+
+    def summary(self):
+        """Сводная статистика по кадрам интервала"""
+        frames = self.frames
+        count = len(frames)
+        if count == 0: #Если кадров нет, статистика пустая
+            return {"frames": 0, "avg_allocs": 0, "max_allocs": 0,
+                    "avg_alloc_bytes": 0, "max_alloc_bytes": 0}
+        return {
+            "frames": count,
+            "avg_allocs": sum(f["allocs"] for f in frames) / count,
+            "max_allocs": max(f["allocs"] for f in frames),
+            "avg_alloc_bytes": sum(f["alloc_bytes"] for f in frames) / count,
+            "max_alloc_bytes": max(f["alloc_bytes"] for f in frames),
+        }
+
+    def report(self):
+        """Текстовый отчет об аллокациях за последний интервал, после него интервал начинается заново"""
+        summary = self.summary()
+        lines = [
+            f"Аллокации: замеренные кадры {self.frame_count - summary['frames'] + 1}-{self.frame_count} "
+            f"(каждый {self.sample_interval}-й)",
+            f"  аллокаций за кадр: в среднем {summary['avg_allocs']:.0f}, максимум {summary['max_allocs']}",
+            f"  байт за кадр: в среднем {summary['avg_alloc_bytes']:.0f}, максимум {summary['max_alloc_bytes']}",
+            "  по фазам (состояние/фаза: аллокаций за кадр, байт за кадр, максимум аллокаций):",
+        ]
+        for (state, name), totals in sorted(self.phase_totals.items()):
+            frames_count = totals["frames"]
+            lines.append(f"    {state}/{name}: {totals['allocs'] / frames_count:.0f}, "
+                         f"{totals['alloc_bytes'] / frames_count:.0f} Б, {totals['max_allocs']}")
+
+            #Функции с наибольшим числом аллокаций в этой фазе
+            sites = sorted(self.sites.get((state, name), {}).items(),
+                           key=lambda item: item[1][0], reverse=True)
+            for code, (allocs, size) in sites[:self.top_sites]:
+                module = os.path.basename(code.co_filename)
+                name = getattr(code, "co_qualname", code.co_name) #co_qualname есть только с Python 3.11
+                lines.append(f"      {module}:{name}: {allocs / frames_count:.1f} аллокаций, "
+                             f"{size / frames_count:.0f} Б за кадр")
+
+        #Дополнительные метрики игры на момент отчета
+        if self.metrics_source is not None:
+            metrics = self.metrics_source()
+            lines.append("  метрики: " + ", ".join(f"{key}={value:g}" for key, value in metrics.items()))
+
+        self.reset_interval()
+        return "\n".join(lines)
+
+
+def measure(fire_interval, warmup_frames=ALLOC_WARMUP_FRAMES, check_frames=ALLOC_CHECK_FRAMES,
+            leak_frames=ALLOC_LEAK_FRAMES):
+    """Замер аллокаций и утечек в игровом процессе без окна
+
+    fire_interval - выстрел каждые N кадров (0 - корабль не стреляет).
+    Популяция астероидов заполняется до бюджета, чтобы проверять худший случай.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy") #Запуск без окна
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    from main import AsteroidsGame
+
+    #Детерминированные часы: фон зависит от времени, а не от скорости машины
+    clock = [0]
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: clock[0] * 1000 // 60
+
+    random.seed(0) #Повторяемые астероиды между запусками
+    game = AsteroidsGame()
+    game.reset_game()
+    game.change_state("gameplay")
+    manager = game.states["gameplay"].asteroid_manager
+
+    fire_event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+
+    def play(frames):
+        """Проигрывание кадров со стрельбой по расписанию"""
+        for _ in range(frames):
+            game.lives = INITIAL_LIVES #Корабль не должен погибнуть за время проверки
+            fire = fire_interval and clock[0] % fire_interval == 0
+            game.run_frame([fire_event] if fire else [])
+            clock[0] += 1
+
+    try:
+        play(warmup_frames)
+
+        #Аллокации считаем с трекером на каждом кадре
+        while len(manager.asteroids) < manager.max_count: #Худший случай O(M·N) для столкновений
+            manager.spawn_asteroid()
+        tracker = AllocationTracker(report_interval=0, history=check_frames,
+                                    metrics_source=game.population_metrics, sample_interval=1)
+        game.alloc_tracker = tracker
+        tracker.start()
+        play(check_frames)
+        tracker.stop()
+        game.alloc_tracker = None
+        summary = tracker.summary()
+        report = tracker.report()
+
+        #Утечки считаем без трекера по блокам после сборки мусора. Окно длинное,
+        #чтобы разница в числе живых астероидов на его краях не влияла на результат
+        summary["leak_blocks"] = None
+        if leak_frames:
+            gc.collect()
+            blocks_before = sys.getallocatedblocks()
+            play(leak_frames)
+            gc.collect()
+            summary["leak_blocks"] = (sys.getallocatedblocks() - blocks_before) / leak_frames
+            report += f"\n  прирост без трекера: {summary['leak_blocks']:.3f} блоков за кадр"
+    finally:
+        pygame.time.get_ticks = get_ticks
+        pygame.quit()
+
+    return summary, report
+
+
+def budget_failures(summary, budget_allocs, budget_bytes, leak_blocks=ALLOC_LEAK_BUDGET_BLOCKS):
+    """Список нарушений бюджета аллокаций"""
+    failures = []
+    if summary["max_allocs"] > budget_allocs:
+        failures.append(f"{summary['max_allocs']} аллокаций за кадр превышает бюджет {budget_allocs}")
+    if summary["max_alloc_bytes"] > budget_bytes:
+        failures.append(f"{summary['max_alloc_bytes']} Б за кадр превышает бюджет {budget_bytes} Б")
+    if summary["leak_blocks"] is not None and summary["leak_blocks"] > leak_blocks:
+        failures.append(f"прирост {summary['leak_blocks']:.3f} блоков за кадр превышает бюджет {leak_blocks}")
+    return failures
+
+
+def self_check(copies=ALLOC_CHURN_COPIES):
+    """Проверка, что бюджет без стрельбы ловит временные копии списка астероидов в каждом кадре"""
+    from main import GameplayState
+
+    update = GameplayState.update
+
+    def churn_update(state):
+        for _ in range(copies): #Временные копии, освобождаемые в том же цикле
+            asteroids = state.asteroids[:]
+            len(asteroids)
+        update(state)
+
+    GameplayState.update = churn_update
+    try:
+        summary, report = measure(0, warmup_frames=60, check_frames=60, leak_frames=0)
+    finally:
+        GameplayState.update = update
+    return summary["max_allocs"] > ALLOC_IDLE_BUDGET_ALLOCS, report
+
+
+#Сценарии проверки: название, интервал выстрелов, бюджет аллокаций и байт за кадр
+SCENARIOS = (
+    ("без стрельбы", 0, ALLOC_IDLE_BUDGET_ALLOCS, ALLOC_IDLE_BUDGET_BYTES),
+    ("стрельба каждые 10 кадров", 10, ALLOC_COMBAT_BUDGET_ALLOCS, ALLOC_COMBAT_BUDGET_BYTES),
+)
+
+
+if __name__ == "__main__":
+    failed = False
+    for name, fire_interval, budget_allocs, budget_bytes in SCENARIOS:
+        summary, report = measure(fire_interval)
+        print(f"Сценарий: {name}")
+        print(report)
+        for failure in budget_failures(summary, budget_allocs, budget_bytes):
+            print(f"ОШИБКА: {failure}")
+            failed = True
+
+    detected, report = self_check()
+    if not detected:
+        print(report)
+        print("ОШИБКА: самопроверка не обнаружила лишние копии списка астероидов")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -32,6 +32,9 @@ ASTEROID_SPAWN_RATE = 60 #Интервал появления новых аст
 ASTEROID_MIN_SIZE = 20 #Минимальный размер астероида в пикселях
 ASTEROID_MAX_SIZE = 50 #Максимальный размер астероида в пикселях
 ASTEROID_COUNT = 5 #Начальное количество астероидов на уровне
+ASTEROID_MAX_COUNT = 20 #Максимальное количество астероидов одновременно
+ASTEROID_MAX_DENSITY = 0.25 #Максимальная доля площади экрана, занятая астероидами
+ASTEROID_MAX_AGE = 1800 #Возраст астероида в кадрах, после которого он улетает за экран
 
 INITIAL_LIVES = 3 #Начальное количество жизней игрока
 EXPLOSION_DURATION = 20 #Длительность анимации взрыва в кадрах
@@ -39,3 +42,17 @@ TITLE_SCREEN_DURATION = 180 #Длительность анимации заст
 
 TITLE_WIDTH = 400 #Ширина прямоугольника заставки в пикселях
 TITLE_HEIGHT = 200 #Высота прямоугольника заставки в пикселях
+
+ALLOC_TRACKING = False #Отслеживание аллокаций по кадрам (только для диагностики: замеренный кадр в ~30 раз медленнее)
+ALLOC_SAMPLE_INTERVAL = 30 #В игре замеряется только каждый N-й кадр, остальные идут с обычной скоростью
+ALLOC_REPORT_INTERVAL = 20 #Интервал вывода отчета об аллокациях в замеренных кадрах
+ALLOC_TOP_SITES = 10 #Количество мест в коде в отчете об аллокациях
+ALLOC_IDLE_BUDGET_ALLOCS = 1200 #Бюджет аллокаций за кадр без стрельбы (замер: 1150)
+ALLOC_IDLE_BUDGET_BYTES = 118000 #Бюджет выделенных байт за кадр без стрельбы (замер: 112612)
+ALLOC_COMBAT_BUDGET_ALLOCS = 2780 #Бюджет аллокаций за кадр при стрельбе (замер: 2660)
+ALLOC_COMBAT_BUDGET_BYTES = 283000 #Бюджет выделенных байт за кадр при стрельбе (замер: 270035)
+ALLOC_LEAK_BUDGET_BLOCKS = 0.05 #Бюджет среднего прироста блоков памяти за кадр без трекера (замер: от -0.025 до -0.003)
+ALLOC_WARMUP_FRAMES = 60 #Кадры прогрева перед проверкой бюджета
+ALLOC_CHECK_FRAMES = 300 #Кадры проверки бюджета аллокаций (с трекером)
+ALLOC_LEAK_FRAMES = 6000 #Кадры проверки утечек (без трекера)
+ALLOC_CHURN_COPIES = 200 #Копий списка астероидов за кадр в самопроверке бюджета
@@ -158,6 +158,8 @@ class Asteroid(GameObject):
         super().__init__(x, y) #Вызов конструктора родителя
         self.size = size #Размер астероида
         self.rotation_speed = random.uniform(ASTEROID_MIN_ROTATION, ASTEROID_MAX_ROTATION) #Случайная скорость вращения
+        self.age = 0 #Возраст астероида в кадрах
+        self.retiring = False #Флаг ухода астероида за экран без возврата
 
         #Случайное направление и скорость
         angle = random.uniform(0, 2 * math.pi) #Случайный угол движения
@@ -177,8 +179,23 @@ class Asteroid(GameObject):
 
     def update(self):
         """Обновление состояния астероида"""
+        self.age += 1 #Увеличиваем возраст
         self.angle += self.rotation_speed #Вращение астероида
-        super().update() #Вызов родительского update
+        if not self.retiring: #Обычный астероид переходит через границы экрана
+            super().update() #Вызов родительского update
+            return
+
+        #Уходящий астероид летит без перехода через границы
+        self.x += self.vx
+        self.y += self.vy
+        if self.is_off_screen(): #Полностью скрылся за экраном
+            self.active = False #Деактивируем астероид
+
+    def is_off_screen(self):
+        """Проверка, что астероид полностью за пределами экрана"""
+        reach = self.size * 1.3 #Наибольшее удаление точки формы от центра
+        return (self.x + reach <= 0 or self.x - reach >= SCREEN_WIDTH or
+                self.y + reach <= 0 or self.y - reach >= SCREEN_HEIGHT)
 
     def draw(self, screen):
         """Отрисовка астероида с текстурой"""
@@ -0,0 +1,89 @@
+import math
+import random
+from config import *
+from game_objects import Asteroid
+
+
+class AsteroidLifecycleManager:
+    """Управление появлением и уходом астероидов в пределах бюджета популяции"""
+
+    def __init__(self, asteroids, max_count=ASTEROID_MAX_COUNT,
+                 max_density=ASTEROID_MAX_DENSITY, max_age=ASTEROID_MAX_AGE):
+        self.asteroids = asteroids #Общий с состоянием игры список астероидов
+        self.max_count = max_count #Максимальное количество астероидов
+        self.max_density = max_density #Максимальная доля площади экрана под астероидами
+        self.max_age = max_age #Возраст, после которого астероид уходит за экран
+        self.spawn_timer = 0 #Таймер для спавна новых астероидов
+        self.spawned = 0 #Всего создано астероидов
+        self.retired = 0 #Всего ушло за экран
+        self.peak_live = 0 #Наибольшее количество астероидов одновременно
+
+    def spawn_asteroid(self):
+        """Создание нового астероида в случайном месте за краем экрана"""
+        #Случайно выбираем сторону появления (0-3)
+        side = random.randint(0, 3)
+        if side == 0:  #Сверху
+            x = random.randint(0, SCREEN_WIDTH)
+            y = -ASTEROID_MAX_SIZE
+        elif side == 1:  #Справа
+            x = SCREEN_WIDTH + ASTEROID_MAX_SIZE
+            y = random.randint(0, SCREEN_HEIGHT)
+        elif side == 2:  #Снизу
+            x = random.randint(0, SCREEN_WIDTH)
+            y = SCREEN_HEIGHT + ASTEROID_MAX_SIZE
+        else:  #Слева
+            x = -ASTEROID_MAX_SIZE
+            y = random.randint(0, SCREEN_HEIGHT)
+
+        #Добавляем новый астероид в список
+        self.asteroids.append(Asteroid(x, y))
+        self.spawned += 1
+        self.peak_live = max(self.peak_live, len(self.asteroids))
+
+    def density(self):
+        """Доля площади экрана, занятая астероидами"""
+        area = sum(math.pi * asteroid.size ** 2 for asteroid in self.asteroids)
+        return area / (SCREEN_WIDTH * SCREEN_HEIGHT)
+
+    def spawn_interval(self):
+        """Интервал спавна, растущий по мере заполнения бюджета"""
+        fill = len(self.asteroids) / self.max_count #Заполненность бюджета (0-1)
+        return int(ASTEROID_SPAWN_RATE * (1 + fill))
+
+    def can_spawn(self):
+        """Проверка бюджета популяции и плотности перед спавном"""
+        if len(self.asteroids) >= self.max_count: #Бюджет исчерпан
+            return False
+        return self.density() < self.max_density #Экран не переполнен
+
+    def update(self):
+        """Обновление астероидов, уход старых и спавн новых"""
+        #Обновление всех астероидов и удаление ушедших за экран
+        for asteroid in self.asteroids[:]:
+            if asteroid.age >= self.max_age: #Астероид прожил отведенное время и уходит за экран
+                asteroid.retiring = True
+            asteroid.update()
+            if not asteroid.active:
+                self.asteroids.remove(asteroid)
+                self.retired += 1
+
+        #Увеличиваем таймер спавна астероидов
+        self.spawn_timer += 1
+        #По достижении порога проверяем бюджет и создаем новый астероид
+        if self.spawn_timer >= self.spawn_interval():
+            if self.can_spawn():
+                self.spawn_asteroid()
+            self.spawn_timer = 0
+
+    def metrics(self):
+        """Метрики популяции астероидов"""
+        live = len(self.asteroids)
+        return {
+            "live": live, #Астероидов сейчас
+            "retiring": sum(1 for asteroid in self.asteroids if asteroid.retiring), #Уходят за экран
+            "peak_live": self.peak_live, #Наибольшее количество одновременно
+            "spawned": self.spawned, #Всего создано
+            "retired": self.retired, #Всего ушло за экран
+            "destroyed": self.spawned - self.retired - live, #Всего уничтожено игроком
+            "density": self.density(), #Доля занятой площади экрана
+        }
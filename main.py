@@ -2,6 +2,8 @@ import pygame
 import sys
 from config import *
 from game_objects import *
+from alloc_tracker import AllocationTracker
+from lifecycle import AsteroidLifecycleManager
 
 
 class GameState:
@@ -124,32 +126,12 @@ class GameplayState(GameState):
         self.missiles = []
         #Список активных взрывов
         self.explosions = []
-        #Таймер для спавна новых астероидов
-        self.asteroid_timer = 0
+        #Менеджер появления и ухода астероидов
+        self.asteroid_manager = AsteroidLifecycleManager(self.asteroids)
 
         #Создание начальных астероидов
         for _ in range(ASTEROID_COUNT):
-            self.spawn_asteroid()
-
-    def spawn_asteroid(self):
-        """Создание нового астероида в случайном месте"""
-        #Случайно выбираем сторону появления (0-3)
-        side = random.randint(0, 3)
-        if side == 0:  #Сверху
-            x = random.randint(0, SCREEN_WIDTH)
-            y = -ASTEROID_MAX_SIZE
-        elif side == 1:  #Справа
-            x = SCREEN_WIDTH + ASTEROID_MAX_SIZE
-            y = random.randint(0, SCREEN_HEIGHT)
-        elif side == 2:  #Снизу
-            x = random.randint(0, SCREEN_WIDTH)
-            y = SCREEN_HEIGHT + ASTEROID_MAX_SIZE
-        else:  #Слева
-            x = -ASTEROID_MAX_SIZE
-            y = random.randint(0, SCREEN_HEIGHT)
-
-        #Добавляем новый астероид в список
-        self.asteroids.append(Asteroid(x, y))
+            self.asteroid_manager.spawn_asteroid()
 
     def handle_events(self, events):
         """Обработка событий игры"""
@@ -183,9 +165,8 @@ class GameplayState(GameState):
         #Обновление позиции корабля
         self.ship.update()
 
-        #Обновление всех астероидов
-        for asteroid in self.asteroids[:]:  # Используем копию списка для безопасного удаления
-            asteroid.update()
+        #Обновление астероидов с учетом бюджета популяции
+        self.asteroid_manager.update()
 
         #Обновление всех ракет и удаление неактивных
         for missile in self.missiles[:]:
@@ -201,13 +182,6 @@ class GameplayState(GameState):
             if not explosion.active:
                 self.explosions.remove(explosion)
 
-        #Увеличиваем таймер спавна астероидов
-        self.asteroid_timer += 1
-        #Если таймер достиг порога, создаем новый астероид
-        if self.asteroid_timer >= ASTEROID_SPAWN_RATE:
-            self.spawn_asteroid()
-            self.asteroid_timer = 0
-
         #Проверка столкновений ракет с астероидами
         for missile in self.missiles[:]:
             for asteroid in self.asteroids[:]:
@@ -314,6 +288,9 @@ class AsteroidsGame:
         #Устанавливаем начальное состояние - заставка
         self.current_state = self.states["title"]
 
+        #Трекер аллокаций памяти (только в режиме отслеживания)
+        self.alloc_tracker = AllocationTracker(metrics_source=self.population_metrics) if ALLOC_TRACKING else None
+
     def change_state(self, state_name):
         """Смена состояния игры"""
         #Устанавливаем текущее состояние по имени
@@ -327,9 +304,36 @@ class AsteroidsGame:
         #Пересоздаем состояние игрового процесса
         self.states["gameplay"] = GameplayState(self)
 
+    def population_metrics(self):
+        """Метрики популяции астероидов текущей игры"""
+        return self.states["gameplay"].asteroid_manager.metrics()
+
+    def run_frame(self, events):
+        """Обработка одного кадра: события, логика и отрисовка"""
+        tracker = self.alloc_tracker
+        if tracker is None or not tracker.sample_frame():
+            #Обычный режим без отслеживания аллокаций
+            self.current_state.handle_events(events)
+            self.current_state.update()
+            self.current_state.draw(self.screen)
+            return
+
+        #Замеряемый кадр: каждую фазу отдельно
+        tracker.begin_frame(type(self.current_state).__name__)
+        with tracker.phase("events"):
+            self.current_state.handle_events(events)
+        with tracker.phase("update"):
+            self.current_state.update()
+        with tracker.phase("draw"):
+            self.current_state.draw(self.screen)
+        tracker.end_frame()
+
     def run(self):
         """Главный игровой цикл"""
         running = True  #Флаг работы игры
+        #Запускаем отслеживание аллокаций, если оно включено
+        if self.alloc_tracker is not None:
+            self.alloc_tracker.start()
 
         #Главный игровой цикл
         while running:
@@ -342,12 +346,8 @@ class AsteroidsGame:
                     #Завершаем игровой цикл
                     running = False
 
-            #Обрабатываем события в текущем состоянии
-            self.current_state.handle_events(events)
-            #Обновляем логику в текущем состоянии
-            self.current_state.update()
-            #Отрисовываем текущее состояние
-            self.current_state.draw(self.screen)
+            #Обрабатываем события, логику и отрисовку текущего состояния
+            self.run_frame(events)
             #Обновляем экран
             pygame.display.flip()
 